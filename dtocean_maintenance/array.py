@@ -26,6 +26,8 @@
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+from __future__ import print_function
+
 import logging
 
 import pandas as pd
@@ -298,7 +300,7 @@ class Array(object):
                               'read from dtocean-reliability. Therefore '
                               'the failure rate is read from component '
                               'table').format(componentID)
-                    print msgStr
+                    print(msgStr)
 
             arrayDict[componentID]['FR List'] = []
 
@@ -465,7 +467,7 @@ class Array(object):
                            msgStr = ('WP6: The impact of {} on devices can '
                                      'not be analysed from '
                                      'dtocean-reliability').format(componentID)
-                           print msgStr
+                           print(msgStr)
 
                     if 'subhub' in componentType:
                         arrayDict[componentID]['Breakdown'] = \
@@ -46,9 +46,15 @@ The module can be described in different core sub-modules:
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+from __future__ import print_function
+
+import copy
 import timeit
 import logging
-from os import path
+from collections import OrderedDict
+from multiprocessing import Pool
+
+import pandas as pd
 
 from dtocean_logistics.phases.operations import logOp_init
 from dtocean_logistics.phases.om import logPhase_om_init
@@ -65,6 +71,103 @@ from dtocean_logistics.load.safe_factors import safety_factors
 # Set up logging
 module_logger = logging.getLogger(__name__)
 
+# Keys of the O&M logistics results which are stored in the solutions cache
+_SOLUTION_KEYS = ('requirement', 'eq_select', 've_select', 'combi_select')
+
+# Maximum number of entries in the solutions cache
+_SOLUTIONS_CACHE_SIZE = 128
+
+# O&M inputs which are left out of the solutions cache key. The start date
+# of the operation only sets the start of the weather window search in
+# sched_om, which is run with the current inputs for every call.
+_SCHEDULE_KEYS = ('t_start [-]',)
+
+# Attributes of the OMLog class, which are also its keys
+_OMLOG_SLOTS = ('port',
+                'requirement',
+                'eq_select',
+                've_select',
+                'combi_select',
+                'cost',
+                'optimal',
+                'risk',
+                'envir',
+                'findSolution')
+_OMLOG_KEYS = frozenset(_OMLOG_SLOTS)
+
+# Vessel database columns and the matching deck requirements
+_DECK_CHECKS = (('Deck space [m^2]', 'deck area'),
+                ('Deck loading [t/m^2]', 'deck loading'),
+                ('Max. cargo [t]', 'deck cargo'))
+
+# Arguments of om_logistics_main shared by the events assessed in a batch
+# worker process
+_batch_worker_args = None
+
+
+class OMLog(object):
+
+    """Results of the O&M logistics assessment. The results are stored as
+    attributes and can also be accessed by key, as required by the
+    dtocean-logistics functions and the maintenance module.
+    """
+
+    __slots__ = _OMLOG_SLOTS
+
+    def __init__(self, port):
+
+        self.port = port
+        self.requirement = {}
+        self.eq_select = {}
+        self.ve_select = {}
+        self.combi_select = {}
+        self.cost = {}
+        self.optimal = {}
+        self.risk = {}
+        self.envir = {}
+        self.findSolution = {}
+
+        return
+
+    def __getitem__(self, key):
+
+        if key not in _OMLOG_KEYS:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+
+        if key not in _OMLOG_KEYS:
+            raise KeyError(key)
+
+        setattr(self, key, value)
+
+        return
+
+    def __contains__(self, key):
+
+        return key in _OMLOG_KEYS
+
+    def keys(self):
+
+        return list(self.__slots__)
+
+    def to_dict(self):
+
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __getstate__(self):
+
+        return self.to_dict()
+
+    def __setstate__(self, state):
+
+        for key, value in state.items():
+            setattr(self, key, value)
+
+        return
+
 
 def om_logistics_main(vessels_0,
                       equipments_0,
@@ -87,7 +190,9 @@ def om_logistics_main(vessels_0,
                       om,
                       PRINT_FLAG,
                       optimise_delay=False,
-                      custom_waiting=None):
+                      custom_waiting=None,
+                      solutions_cache=None,
+                      prescaled=False):
 
     """
     Parameters
@@ -120,12 +225,26 @@ def om_logistics_main(vessels_0,
 
     Others...
 
+    solutions_cache (OrderedDict, optional):
+        dictionary used to store the feasible solutions found for each
+        logistic phase and O&M input, so that they are reused by later calls
+        with the same inputs. The start date of the operation is not part
+        of the inputs compared and O&M inputs with missing values are not
+        stored. At most 128 entries are kept, removing the least recently
+        used first. The logistic databases and safety factors must not
+        change between calls sharing the dictionary.
+
+    prescaled (bool, optional):
+        if True, the safety factors have already been applied to the ports,
+        vessels and equipments databases and port_sf, vessel_sf and eq_sf are
+        ignored.
+
     Returns
     -------
 
-    install (dict):
-        dictionnary compiling all key results obtained from the assessment of
-        the logistic phases:
+    install (OMLog):
+        object compiling all key results obtained from the assessment of
+        the logistic phases, accessed as attributes or by key:
 
         'requirement' (tuple):
             minimum requirements returned from thefeasibility functions
@@ -140,45 +259,38 @@ def om_logistics_main(vessels_0,
     
     """
 
+    # apply dafety factors in vessels parameters
+#    start_time_sf = timeit.default_timer()
 
-    # # Set directory paths for loading inputs
-    mod_path = path.dirname(path.realpath(__file__))
-
-
-    def database_file(file):
-        """
-        shortcut function to load files from the database folder
-        """
-        fpath = path.join('databases', '{0}'.format(file))
-        db_path = path.join(mod_path, fpath)
-        return db_path
+    if prescaled:
 
+        ports = ports_0
+        vessels = vessels_0
+        equipments = equipments_0
 
-    # apply dafety factors in vessels parameters
-#    start_time_sf = timeit.default_timer()
+    else:
 
-    (ports,
-     vessels,
-     equipments) = safety_factors(ports_0,
-                                  vessels_0,
-                                  equipments_0,
-                                  port_sf,
-                                  vessel_sf,
-                                  eq_sf)
+        (ports,
+         vessels,
+         equipments) = safety_factors(ports_0,
+                                      vessels_0,
+                                      equipments_0,
+                                      port_sf,
+                                      vessel_sf,
+                                      eq_sf)
 
 #    stop_time_sf = timeit.default_timer()
     # print 'Safety factors simulation time [s]: ' +
     # str(stop_time_sf - start_time_sf)
 
-    start_time = timeit.default_timer()
-
     if PRINT_FLAG:
-        print 'START!'
+        start_time = timeit.default_timer()
+        print('START!')
 
     # Collecting relevant port information
 
-    om_port_index = om['Port_Index [-]'].iloc[0]
-#    om_port_distance = om['Dist_port [km]'].iloc[0]
+    om_port_index = om['Port_Index [-]'].iat[0]
+#    om_port_distance = om['Dist_port [km]'].iat[0]
     om_port = {}
     om_port['Selected base port for installation'] = ports.iloc[om_port_index]
 
@@ -186,76 +298,87 @@ def om_logistics_main(vessels_0,
     
     # if this data does not exit use first position of the site data
     if len(entry_point)==0:
-        entry_point['x coord [m]'] = site['x coord [m]'].iloc[0]
-        entry_point['y coord [m]'] = site['y coord [m]'].iloc[0]
-        entry_point['zone [-]'] = site['zone [-]'].iloc[0]
-        entry_point['bathymetry [m]'] = site['bathymetry [m]'].iloc[0]
-        entry_point['soil type [-]'] = site['soil type [-]'].iloc[0]
+        site_row = site.iloc[0]
+        entry_point['x coord [m]'] = site_row['x coord [m]']
+        entry_point['y coord [m]'] = site_row['y coord [m]']
+        entry_point['zone [-]'] = site_row['zone [-]']
+        entry_point['bathymetry [m]'] = site_row['bathymetry [m]']
+        entry_point['soil type [-]'] = site_row['soil type [-]']
 
 
-    # Initialising logistic operations and logistic phase
-    logOp = logOp_init(schedule_OLC)
-
-    logPhase_om = logPhase_om_init(logOp, vessels, equipments, om)
-
     # Select the suitable Log phase id
     log_phase_id = logPhase_select(om)
-    log_phase = logPhase_om[log_phase_id]
-    log_phase.op_ve_init = log_phase.op_ve
 
     ## Assessing the O&M logistic phase requested
 
-    # Initialising the output dictionary to be passed to the O&M module
-    om_log = {'port': om_port,
-              'requirement': {},
-              'eq_select': {},
-              've_select': {},
-              'combi_select': {},
-              'cost': {},
-              'optimal': {},
-              'risk': {},
-              'envir': {},
-              'findSolution': {}
-              }
+    # Initialising the output object to be passed to the O&M module
+    om_log = OMLog(om_port)
 
-    # Characterizing the logistic requirements
-    om_log['requirement'] = feas_om(log_phase,
-                                    log_phase_id,
-                                    om,
-                                    device,
-                                    sub_device,
-                                    collection_point,
-                                    connectors,
-                                    dynamic_cable,
-                                    static_cable)
+    port = om_port['Selected base port for installation']
 
-    # Selecting the maritime infrastructure satisfying the logistic
-    # requirements
-    om_log['eq_select'], log_phase = select_e(om_log, log_phase)
-    om_log['ve_select'], log_phase = select_v(om_log, log_phase)
+    # Reuse the feasible solutions of a previous call with the same inputs,
+    # if available
+    if solutions_cache is None:
+        cache_key = None
+    else:
+        cache_key = _get_cache_key(log_phase_id, om)
 
-    # Matching requirements to ensure compatiblity of combinations of
-    # port/vessel(s)/equipment leading to feasible logistic solutions
-    port = om_port['Selected base port for installation']
-    
-    (om_log['combi_select'],
-     log_phase,
-     MATCH_FLAG) = compatibility_ve(om_log, log_phase, port)
+    if cache_key is not None and cache_key in solutions_cache:
+
+        # Move the entry to the end, as the most recently used
+        cached = solutions_cache.pop(cache_key)
+        solutions_cache[cache_key] = cached
+
+        (log_phase,
+         solutions,
+         MATCH_FLAG) = copy.deepcopy(cached)
+        for key, value in solutions.items():
+            setattr(om_log, key, value)
+
+    else:
+
+        (log_phase,
+         MATCH_FLAG) = _find_solutions(om_log,
+                                       log_phase_id,
+                                       schedule_OLC,
+                                       vessels,
+                                       equipments,
+                                       port,
+                                       device,
+                                       sub_device,
+                                       collection_point,
+                                       dynamic_cable,
+                                       static_cable,
+                                       connectors,
+                                       om)
+
+        if cache_key is not None:
+
+            # Remove the least recently used entries
+            while len(solutions_cache) >= _SOLUTIONS_CACHE_SIZE:
+                solutions_cache.pop(next(iter(solutions_cache)))
+
+            solutions = {key: getattr(om_log, key)
+                                            for key in _SOLUTION_KEYS}
+            solutions_cache[cache_key] = copy.deepcopy((log_phase,
+                                                        solutions,
+                                                        MATCH_FLAG))
 
     if MATCH_FLAG == 'NoSolutions':
         
-        ves_req = {'deck area [m^2]': om_log['requirement'][5]['deck area'],
-                   'deck cargo [t]': om_log['requirement'][5]['deck cargo'],
+        ves_req = {'deck area [m^2]': om_log.requirement[5]['deck area'],
+                   'deck cargo [t]': om_log.requirement[5]['deck cargo'],
                    'deck loading [t/m^2]':
-                                   om_log['requirement'][5]['deck loading']}
+                                   om_log.requirement[5]['deck loading']}
             
-        msg = 'No vessel solutions found. Requirements: {}'.format(ves_req)
-        module_logger.warning(msg)
+        module_logger.warning('No vessel solutions found. Requirements: %s',
+                              ves_req)
             
         if PRINT_FLAG:
-            print msg
+            print('No vessel solutions found. '
+                  'Requirements: {}'.format(ves_req))
             
-        om_log['findSolution'] = 'NoSolutionsFound'
+        om_log.findSolution = 'NoSolutionsFound'
         
     else:
         
@@ -279,40 +402,43 @@ def om_logistics_main(vessels_0,
             msg = 'No weather windows found'
             module_logger.warning(msg)
             
-            if PRINT_FLAG: print msg
+            if PRINT_FLAG: print(msg)
             
-            om_log['findSolution'] = 'NoWeatherWindowFound'
+            om_log.findSolution = 'NoWeatherWindowFound'
             
         else:
             
             # Estimating the cost associated with all feasible logistic
             # solutions
-            om_log['cost'], log_phase = cost(om_log,
-                                             log_phase,
-                                             log_phase_id,
-                                             other_rates)
+            om_log.cost, log_phase = cost(om_log,
+                                          log_phase,
+                                          log_phase_id,
+                                          other_rates)
 
             # Identifying the optimal logistic solution as being the least
             # costly one
-            om_log['optimal'] = opt_sol(log_phase, log_phase_id)
-            om_log['findSolution'] = 'SolutionFound'
+            om_log.optimal = opt_sol(log_phase, log_phase_id)
+            om_log.findSolution = 'SolutionFound'
 
             if PRINT_FLAG:
                 
-                print 'Final Solution Found!'
-
-                print 'Solution Total Cost [EURO]: ' + \
-                                str(om_log['optimal']['total cost'])
-                print 'Solution Schedule preparation time [h]:' + \
-                                str(om_log['optimal']['schedule prep time'])
-                print 'Solution Schedule waiting time [h]:' + \
-                                str(om_log['optimal']['schedule waiting time'])
-                print 'Solution Schedule sea time [h]: ' + \
-                                str(om_log['optimal']['schedule sea time'])
-                print 'Solution Schedule TOTAL time [h]: ' + \
-                            str(om_log['optimal']['schedule prep time'] +
-                                om_log['optimal']['schedule waiting time'] +
-                                om_log['optimal']['schedule sea time'])
+                print('Final Solution Found!')
+
+                optimal = om_log.optimal
+                total_time = (optimal['schedule prep time'] +
+                              optimal['schedule waiting time'] +
+                              optimal['schedule sea time'])
+
+                print('Solution Total Cost [EURO]: {}'.format(
+                                                    optimal['total cost']))
+                print('Solution Schedule preparation time [h]: {}'.format(
+                                            optimal['schedule prep time']))
+                print('Solution Schedule waiting time [h]: {}'.format(
+                                            optimal['schedule waiting time']))
+                print('Solution Schedule sea time [h]: {}'.format(
+                                            optimal['schedule sea time']))
+                print('Solution Schedule TOTAL time [h]: {}'.format(
+                                                                total_time))
 
                 # print 'Solution VE combination:'
                 # print om_log['optimal']['vessel_equipment']
@@ -320,13 +446,319 @@ def om_logistics_main(vessels_0,
                 # OUTPUT_dict = out_process(log_phase, om_log)
                 # print OUTPUT_dict
 
-    stop_time = timeit.default_timer()
-
     if PRINT_FLAG:
         
-        print 'Simulation Duration [s]: ' + str(stop_time - start_time)
+        stop_time = timeit.default_timer()
+
+        print('Simulation Duration [s]: {}'.format(stop_time - start_time))
 
-        print 'om_log[''findSolution'']: ' + om_log['findSolution']
-        print 'FINISH!'
+        print("om_log['findSolution']: {}".format(om_log.findSolution))
+        print('FINISH!')
 
     return om_log
+
+
+def om_logistics_batch(vessels_0,
+                       equipments_0,
+                       ports_0,
+                       schedule_OLC,
+                       other_rates,
+                       port_sf,
+                       vessel_sf,
+                       eq_sf,
+                       site,
+                       metocean,
+                       device,
+                       sub_device,
+                       entry_point,
+                       layout,
+                       collection_point,
+                       dynamic_cable,
+                       static_cable,
+                       connectors,
+                       oms,
+                       PRINT_FLAG,
+                       optimise_delay=False,
+                       custom_waiting=None,
+                       solutions_cache=None,
+                       prescaled=False,
+                       parallel=False,
+                       processes=None):
+
+    """Assess the logistics of multiple O&M events, given as the rows of
+    oms. The safety factors are applied once for all events and the feasible
+    solutions are shared between events with the same logistic phase and
+    O&M inputs, so only the schedule and cost are assessed per event.
+
+    Parameters
+    ----------
+    oms (DataFrame):
+        O&M inputs with one row per event, with the same columns as the om
+        argument of om_logistics_main
+    parallel (bool, optional):
+        assess the events in a pool of worker processes. Each worker starts
+        from a copy of solutions_cache, and the solutions found by the
+        workers are not added to it. Defaults to False.
+    processes (int, optional):
+        number of worker processes if parallel is True. Defaults to the
+        number of CPUs.
+
+    Others as for om_logistics_main.
+
+    Returns
+    -------
+
+    om_logs (list):
+        OMLog objects as returned by om_logistics_main, in the order of the
+        rows of oms
+
+    """
+
+    if prescaled:
+
+        ports = ports_0
+        vessels = vessels_0
+        equipments = equipments_0
+
+    else:
+
+        (ports,
+         vessels,
+         equipments) = safety_factors(ports_0,
+                                      vessels_0,
+                                      equipments_0,
+                                      port_sf,
+                                      vessel_sf,
+                                      eq_sf)
+
+    if solutions_cache is None:
+        solutions_cache = OrderedDict()
+
+    if parallel:
+
+        main_args = (vessels,
+                     equipments,
+                     ports,
+                     schedule_OLC,
+                     other_rates,
+                     port_sf,
+                     vessel_sf,
+                     eq_sf,
+                     site,
+                     metocean,
+                     device,
+                     sub_device,
+                     entry_point,
+                     layout,
+                     collection_point,
+                     dynamic_cable,
+                     static_cable,
+                     connectors)
+        main_options = (PRINT_FLAG,
+                        optimise_delay,
+                        custom_waiting)
+
+        oms_list = [oms.iloc[[i]].reset_index(drop=True)
+                    for i in range(len(oms))]
+
+        pool = Pool(processes,
+                    _init_batch_worker,
+                    (main_args, main_options, solutions_cache))
+
+        try:
+            om_logs = pool.map(_om_logistics_worker, oms_list)
+        finally:
+            pool.terminate()
+            pool.join()
+
+        return om_logs
+
+    om_logs = []
+
+    for i in range(len(oms)):
+
+        om = oms.iloc[[i]].reset_index(drop=True)
+
+        om_log = om_logistics_main(vessels,
+                                   equipments,
+                                   ports,
+                                   schedule_OLC,
+                                   other_rates,
+                                   port_sf,
+                                   vessel_sf,
+                                   eq_sf,
+                                   site,
+                                   metocean,
+                                   device,
+                                   sub_device,
+                                   entry_point,
+                                   layout,
+                                   collection_point,
+                                   dynamic_cable,
+                                   static_cable,
+                                   connectors,
+                                   om,
+                                   PRINT_FLAG,
+                                   optimise_delay,
+                                   custom_waiting,
+                                   solutions_cache,
+                                   prescaled=True)
+
+        om_logs.append(om_log)
+
+    return om_logs
+
+
+def _init_batch_worker(main_args, main_options, solutions_cache):
+
+    """Store the arguments of om_logistics_main shared by the events
+    assessed in a batch worker process, so that the databases are passed to
+    each worker only once.
+    """
+
+    global _batch_worker_args
+
+    _batch_worker_args = (main_args, main_options, solutions_cache)
+
+    return
+
+
+def _om_logistics_worker(om):
+
+    """Assess the logistics of a single O&M event in a batch worker process.
+    """
+
+    main_args, main_options, solutions_cache = _batch_worker_args
+
+    args = main_args + (om,) + main_options + (solutions_cache,)
+
+    return om_logistics_main(*args, prescaled=True)
+
+
+def _find_solutions(om_log,
+                    log_phase_id,
+                    schedule_OLC,
+                    vessels,
+                    equipments,
+                    port,
+                    device,
+                    sub_device,
+                    collection_point,
+                    dynamic_cable,
+                    static_cable,
+                    connectors,
+                    om):
+
+    """Initialise the requested O&M logistic phase and find the feasible
+    combinations of port, vessels and equipment. The requirement,
+    eq_select, ve_select and combi_select attributes of om_log are set in
+    place.
+
+    Returns
+    -------
+
+    log_phase (LogPhase): the initialised logistic phase
+    MATCH_FLAG (str): 'NoSolutions' if no feasible combination was found
+
+    """
+
+    # Initialising logistic operations and logistic phase
+    logOp = logOp_init(schedule_OLC)
+
+    logPhase_om = logPhase_om_init(logOp, vessels, equipments, om)
+
+    log_phase = logPhase_om[log_phase_id]
+    log_phase.op_ve_init = log_phase.op_ve
+
+    # Characterizing the logistic requirements
+    om_log.requirement = feas_om(log_phase,
+                                 log_phase_id,
+                                 om,
+                                 device,
+                                 sub_device,
+                                 collection_point,
+                                 connectors,
+                                 dynamic_cable,
+                                 static_cable)
+
+    # Skip the selection and matching if no vessel can meet the deck
+    # requirements
+    if not _check_deck_requirements(vessels, om_log.requirement[5]):
+        return log_phase, 'NoSolutions'
+
+    # Selecting the maritime infrastructure satisfying the logistic
+    # requirements
+    om_log.eq_select, log_phase = select_e(om_log, log_phase)
+    om_log.ve_select, log_phase = select_v(om_log, log_phase)
+
+    # Matching requirements to ensure compatiblity of combinations of
+    # port/vessel(s)/equipment leading to feasible logistic solutions
+    (om_log.combi_select,
+     log_phase,
+     MATCH_FLAG) = compatibility_ve(om_log, log_phase, port)
+
+    return log_phase, MATCH_FLAG
+
+
+def _get_cache_key(log_phase_id, om):
+
+    """Build the solutions cache key of the given logistic phase and O&M
+    inputs, from every row of om, as the logistic phase and its requirements
+    depend on the whole table. The schedule inputs are left out of the key.
+
+    Returns
+    -------
+
+    cache_key (tuple): the cache key, or None if the inputs contain missing
+        or unhashable values
+
+    """
+
+    key_om = om.drop(list(_SCHEDULE_KEYS), axis=1, errors='ignore')
+
+    # Missing values never compare equal
+    if key_om.isnull().values.any(): return None
+
+    cache_key = (log_phase_id,
+                 len(key_om),
+                 tuple(tuple(row) for row in key_om.values))
+
+    try:
+        hash(cache_key)
+    except TypeError:
+        return None
+
+    return cache_key
+
+
+def _check_deck_requirements(vessels, deck_requirements):
+
+    """Check that at least one vessel satisfies all of the deck area, deck
+    loading and deck cargo requirements. Missing requirements are ignored.
+
+    As in the vessel selection and matching of dtocean-logistics, a solution
+    is assumed to need a single vessel that meets all of the deck
+    requirements. If no vessel does, compatibility_ve can not find a
+    solution either. A vessel with a missing deck value is not ruled out by
+    that requirement; the check then leaves the decision to the full
+    matching. So the check only fails when the full matching would also
+    find no solutions.
+
+    Returns
+    -------
+
+    bool: True if a vessel may satisfy the requirements
+
+    """
+
+    feasible = pd.Series(True, index=vessels.index)
+
+    for column, key in _DECK_CHECKS:
+
+        requirement = deck_requirements[key]
+        if pd.isnull(requirement): continue
+
+        values = vessels[column]
+        feasible &= (values >= requirement) | values.isnull()
+
+    return feasible.any()
@@ -26,13 +26,15 @@
 """
 
 # Standard modules
+from __future__ import print_function
+
 import copy
 import math
-import string
 import timeit
 import logging
 import datetime
 from datetime import timedelta
+from collections import OrderedDict
 
 # 3rd party modules
 import numpy as np
@@ -138,7 +140,7 @@ class LCOE_Statistics(object):
         custom_waiting = WaitingTime(metocean)
                 
         # Run simulations and collect results
-        for sim_number in xrange(n_sims):
+        for sim_number in range(n_sims):
             
             msg = ('Executing data point number {}').format(sim_number)
             module_logger.info(msg)
@@ -539,12 +541,17 @@ class LCOE_Calculator(object):
         self.__totalActionDelayHour (float) [hour]: total repair action delay
         self.__actActionDelayHour (float) [hour]: actual action delay
         self.__outputsOfWP6 (dict) [-]: output of WP6
-        self.__om_logistic (dict) [-]: output of logistic
+        self.__om_logistic (OMLog) [-]: output of logistic
         self.__OUTPUT_dict_logistic (dict) [-]: output of logistic
         self.__logPhase_om (class) [-]: logistic parameter
         self.__vessels (dict) [-]: logistic parameter
         self.__equipments (dict) [-]: logistic parameter
         self.__ports (DataFrame) [-]: logistic parameter
+        self.__vessels_safe (DataFrame) [-]: vessels with safety factors
+        self.__equipments_safe (dict) [-]: equipments with safety factors
+        self.__ports_safe (DataFrame) [-]: ports with safety factors
+        self.__logistic_solutions (OrderedDict) [-]: cache of logistic
+            solutions
         self.__portDistIndex (dict) [-]: logistic parameter
         self.__phase_order (DataFrame) [-]: logistic parameter
         self.__site (DataFrame) [-]: logistic parameter
@@ -909,6 +916,9 @@ class LCOE_Calculator(object):
         # Declaration of variable for logistic (class)
         self.__logPhase_om = None
 
+        # Declaration of feasible logistic solutions cache (OrderedDict)
+        self.__logistic_solutions = OrderedDict()
+
          # Declaration of variable for logistic (?)
         self.__vessels = self.__Logistic_Param['vessels']
 
@@ -961,6 +971,17 @@ class LCOE_Calculator(object):
         self.__schedule_OLC = self.__Logistic_Param['schedule_OLC']
         self.__other_rates = self.__Logistic_Param['other_rates']
 
+        # Logistic databases with safety factors applied (DataFrame)
+        (self.__ports_safe,
+         self.__vessels_safe,
+         self.__equipments_safe) = safety_factors(
+                                            copy.deepcopy(self.__ports),
+                                            copy.deepcopy(self.__vessels),
+                                            copy.deepcopy(self.__equipments),
+                                            copy.deepcopy(self.__port_sf),
+                                            copy.deepcopy(self.__vessel_sf),
+                                            copy.deepcopy(self.__eq_sf))
+
         # Initialise logistic operations and logistic phase
 
         # keys of dataframe for logistic functions
@@ -1302,7 +1323,7 @@ class LCOE_Calculator(object):
             else:
                 index = 0
                 for iCnt1 in range(0,len(newColumns)):
-                    if idList[iCnt] == string.rsplit(newColumns[iCnt1],'_')[0]:
+                    if idList[iCnt] == newColumns[iCnt1].rsplit('_')[0]:
                          index = index + 1
 
                 if index == 0:
@@ -2129,15 +2150,10 @@ class LCOE_Calculator(object):
             #self.__om_logistic_outputs = pd.DataFrame(index=[0],columns=keys)
             self.__wp6_outputsForLogistic.iloc[0] = values
 
-            # apply dafety factors in vessels parameters
-            (ports,
-             vessels,
-             equipments) = safety_factors(copy.deepcopy(self.__ports),
-                                          copy.deepcopy(self.__vessels),
-                                          copy.deepcopy(self.__equipments),
-                                          copy.deepcopy(self.__port_sf),
-                                          copy.deepcopy(self.__vessel_sf),
-                                          copy.deepcopy(self.__eq_sf))
+            # use databases with safety factors applied
+            ports = copy.deepcopy(self.__ports_safe)
+            vessels = copy.deepcopy(self.__vessels_safe)
+            equipments = copy.deepcopy(self.__equipments_safe)
 
             # Collecting relevant port information
             om_port_index = \
@@ -2235,16 +2251,16 @@ class LCOE_Calculator(object):
                                               sp_height])
 
                 if self.__dtocean_maintenance_PRINT_FLAG == True:
-                    print 'WP6: loop = ', loop
-                    print 'WP6: ComponentID = ', ComponentID
-                    print 'WP6: RA_ID = ', RA_ID
-                    print 'WP6: FM_ID = ', FM_ID
-                    print 'WP6: values = ', values
-                    print 'NoSolution'
-                    print 'calcLogistic: Simulation Duration [s]: ' + \
-                            str(stop_time_logistic - start_time_logistic)
-                    print ''
-                    print ''
+                    print('WP6: loop = ', loop)
+                    print('WP6: ComponentID = ', ComponentID)
+                    print('WP6: RA_ID = ', RA_ID)
+                    print('WP6: FM_ID = ', FM_ID)
+                    print('WP6: values = ', values)
+                    print('NoSolution')
+                    print('calcLogistic: Simulation Duration [s]: {}'.format(
+                            stop_time_logistic - start_time_logistic))
+                    print('')
+                    print('')
 #                '''else:
 #                    if self.__dtocean_maintenance_PRINT_FLAG == True:
 #                        print 'WP6: loop = ', loop
@@ -2506,11 +2522,11 @@ class LCOE_Calculator(object):
 
         if self.__dtocean_maintenance_PRINT_FLAG == True:
 
-            print 'WP6: ******************************************************'
-            print 'WP6: actIdxOfCoBaMa = ', self.__actIdxOfCoBaMa
-            print 'WP6: ComponentID    = ', ComponentID
-            print 'WP6: RA_ID = ', RA_ID
-            print 'WP6: FM_ID = ', FM_ID
+            print('WP6: *****************************************************')
+            print('WP6: actIdxOfCoBaMa = ', self.__actIdxOfCoBaMa)
+            print('WP6: ComponentID    = ', ComponentID)
+            print('WP6: RA_ID = ', RA_ID)
+            print('WP6: FM_ID = ', FM_ID)
 
         # Calculate the cost of operation at alarm date
         # independent from inspection or repair action
@@ -2646,14 +2662,14 @@ class LCOE_Calculator(object):
         stop_time_logistic = timeit.default_timer()
 
         if self.__dtocean_maintenance_PRINT_FLAG == True:
-            print 'calcLogistic: Simulation Duration [s]: ' + \
-                                str(stop_time_logistic - start_time_logistic)
+            print('calcLogistic: Simulation Duration [s]: {}'.format(
+                                stop_time_logistic - start_time_logistic))
 
         if self.__om_logistic['findSolution'] == 'NoSolutionsFound':
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'WP6: ErrorID = NoSolutionsFound!'
-                print 'WP6: values = ', values
+                print('WP6: ErrorID = NoSolutionsFound!')
+                print('WP6: values = ', values)
 
             # increase the index
             self.__actIdxOfCoBaMa = self.__actIdxOfCoBaMa + 1
@@ -2664,15 +2680,16 @@ class LCOE_Calculator(object):
                                     (stop_time_logistic - start_time_logistic)
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'calcCoBaMa: Simulation Duration [s]: ' + str(duration)
+                print('calcCoBaMa: Simulation Duration [s]: {}'.format(
+                                                                    duration))
 
             raise RuntimeError(self.__om_logistic['findSolution'])
 
         if self.__om_logistic['findSolution'] == 'NoWeatherWindowFound':
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'WP6: ErrorID = NoWeatherWindowFound!'
-                print 'WP6: values = ', values
+                print('WP6: ErrorID = NoWeatherWindowFound!')
+                print('WP6: values = ', values)
 
             # time consumption CaBaMa
             stop_time_CoBaMa = timeit.default_timer()
@@ -2680,7 +2697,8 @@ class LCOE_Calculator(object):
                                     (stop_time_logistic - start_time_logistic)
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'calcCoBaMa: Simulation Duration [s]: ' + str(duration)
+                print('calcCoBaMa: Simulation Duration [s]: {}'.format(
+                                                                    duration))
 
             raise RuntimeError(self.__om_logistic['findSolution'])
 
@@ -3101,7 +3119,7 @@ class LCOE_Calculator(object):
                                 (stop_time_logistic - start_time_logistic)
 
         if self.__dtocean_maintenance_PRINT_FLAG == True:
-            print 'calcCoBaMa: Simulation Duration [s]: ' + str(duration)
+            print('calcCoBaMa: Simulation Duration [s]: {}'.format(duration))
 
         return loop, loopValuesForOutput_CoBaMa, flagCalcCoBaMa
 
@@ -3256,7 +3274,7 @@ class LCOE_Calculator(object):
 
         if divModBlockNumber[0] > 0:
 
-            for _ in xrange(divModBlockNumber[0]):
+            for _ in range(divModBlockNumber[0]):
                 blockNumberList.append(self.__CaBaMa_nrOfMaxActions)
 
         if divModBlockNumber[1] > 0:
@@ -3279,11 +3297,11 @@ class LCOE_Calculator(object):
                                                             self.__strFormat1)
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'WP6: **************************************************'
-                print 'WP6: actIdxOfCaBaMa = ', self.__actIdxOfCaBaMa
-                print 'WP6: ComponentID = ', ComponentID
-                print 'WP6: RA_ID = ', RA_ID
-                print 'WP6: FM_ID = ', FM_ID
+                print('WP6: *************************************************')
+                print('WP6: actIdxOfCaBaMa = ', self.__actIdxOfCaBaMa)
+                print('WP6: ComponentID = ', ComponentID)
+                print('WP6: RA_ID = ', RA_ID)
+                print('WP6: FM_ID = ', FM_ID)
 
             # break the while loop if repairActionDate is greater than
             # self.__endOperationDate
@@ -3485,8 +3503,8 @@ class LCOE_Calculator(object):
             stop_time_logistic = timeit.default_timer()
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'calcLogistic: Simulation Duration [s]: ' + \
-                            str(stop_time_logistic - start_time_logistic)
+                print('calcLogistic: Simulation Duration [s]: {}'.format(
+                            stop_time_logistic - start_time_logistic))
 
             # clear wp6_outputsForLogistic
             if blockNumber > 1:
@@ -3504,10 +3522,10 @@ class LCOE_Calculator(object):
                     flag = self.__om_logistic['findSolution']
 
                     if flag == 'NoSolutionsFound':
-                         print 'WP6: ErrorID = NoSolutionsFound!'
+                         print('WP6: ErrorID = NoSolutionsFound!')
 
                     if flag == 'NoWeatherWindowFound':
-                         print 'WP6: ErrorID = NoWeatherWindowFound!'
+                         print('WP6: ErrorID = NoWeatherWindowFound!')
                 
                 raise RuntimeError(self.__om_logistic['findSolution'])
 
@@ -3702,7 +3720,7 @@ class LCOE_Calculator(object):
                 time = (stop_time_CaBaMa - start_time_CaBaMa) - \
                             (stop_time_logistic - start_time_logistic)
 
-                print 'calcCaBaMa: Simulation Duration [s]: ' + str(time)
+                print('calcCaBaMa: Simulation Duration [s]: {}'.format(time))
                 
             vessel_equip = self.__om_logistic['optimal']['vessel_equipment']
             vessel_name = vessel_equip[0][2]["Name"]
@@ -3954,11 +3972,11 @@ class LCOE_Calculator(object):
 
         if self.__dtocean_maintenance_PRINT_FLAG == True:
 
-            print 'WP6: ******************************************************'
-            print 'WP6: actIdxOfUnCoMa = ', self.__actIdxOfUnCoMa
-            print 'WP6: ComponentID = ', ComponentID
-            print 'WP6: RA_ID = ', RA_ID
-            print 'WP6: FM_ID = ', FM_ID
+            print('WP6: *****************************************************')
+            print('WP6: actIdxOfUnCoMa = ', self.__actIdxOfUnCoMa)
+            print('WP6: ComponentID = ', ComponentID)
+            print('WP6: RA_ID = ', RA_ID)
+            print('WP6: FM_ID = ', FM_ID)
 
         # independent from inspection or repair action
         failure = self.__Failure_Mode[CompIDWithIndex]
@@ -4109,22 +4127,22 @@ class LCOE_Calculator(object):
         stop_time_logistic = timeit.default_timer()
 
         if self.__dtocean_maintenance_PRINT_FLAG == True:
-            print 'calcLogistic: Simulation Duration [s]: ' + \
-                            str(stop_time_logistic - start_time_logistic)
+            print('calcLogistic: Simulation Duration [s]: {}'.format(
+                            stop_time_logistic - start_time_logistic))
 
         if self.__om_logistic['findSolution'] == 'NoSolutionsFound':
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'WP6: ErrorID = NoSolutionsFound!'
-                print 'WP6: values = ', values
+                print('WP6: ErrorID = NoSolutionsFound!')
+                print('WP6: values = ', values)
 
             raise RuntimeError(self.__om_logistic['findSolution'])
 
         if self.__om_logistic['findSolution'] == 'NoWeatherWindowFound':
 
             if self.__dtocean_maintenance_PRINT_FLAG == True:
-                print 'WP6: ErrorID = NoWeatherWindowFound!'
-                print 'WP6: values = ', values
+                print('WP6: ErrorID = NoWeatherWindowFound!')
+                print('WP6: values = ', values)
 
             raise RuntimeError(self.__om_logistic['findSolution'])
 
@@ -4282,7 +4300,7 @@ class LCOE_Calculator(object):
 
             time = (stop_time_UnCoMa - start_time_UnCoMa) - \
                                 (stop_time_logistic - start_time_logistic)
-            print 'calcUnCoMa: Simulation Duration [s]: ' + str(time)
+            print('calcUnCoMa: Simulation Duration [s]: {}'.format(time))
 
         return (loop,
                 loopValuesForOutput_UnCoMa,
@@ -4297,14 +4315,15 @@ class LCOE_Calculator(object):
         '''
 
         self.__om_logistic = om_logistics_main(
-                                           copy.deepcopy(self.__vessels),
-                                           copy.deepcopy(self.__equipments),
-                                           copy.deepcopy(self.__ports),
+                                           copy.deepcopy(self.__vessels_safe),
+                                           copy.deepcopy(
+                                                    self.__equipments_safe),
+                                           copy.deepcopy(self.__ports_safe),
                                            self.__schedule_OLC,
                                            self.__other_rates,
-                                           copy.deepcopy(self.__port_sf),
-                                           copy.deepcopy(self.__vessel_sf),
-                                           copy.deepcopy(self.__eq_sf),
+                                           self.__port_sf,
+                                           self.__vessel_sf,
+                                           self.__eq_sf,
                                            self.__site,
                                            self.__metocean,
                                            self.__device,
@@ -4318,7 +4337,9 @@ class LCOE_Calculator(object):
                                            self.__wp6_outputsForLogistic,
                                            self.__dtocean_logistics_PRINT_FLAG,
                                            optimise_delay,
-                                           self.__custom_waiting)
+                                           self.__custom_waiting,
+                                           self.__logistic_solutions,
+                                           prescaled=True)
 
         return
 
@@ -28,7 +28,6 @@ classes.
 
 import math
 import bisect
-import random
 import datetime
 
 import numpy as np
@@ -37,6 +36,18 @@ from dateutil.relativedelta import relativedelta
 
 from dtocean_economics.functions import get_present_values, get_lcoe
 
+try:
+    import numba
+    from numba import prange
+except ImportError:
+    numba = None
+    prange = range
+
+# Number of poisson trials drawn from each random seed by numba. Trials are
+# run in parallel by block, so results do not depend on the number of
+# threads.
+_POISSON_BLOCK_SIZE = 50
+
 
 class Availability(object):
     
@@ -190,7 +201,7 @@ def get_uptime_df(commissioning_date,
     for device_id in device_ids:
         uptime_dict[device_id] = [1] * len(uptime_dates)
     
-    for event_df in events_tables_dict.itervalues():
+    for event_df in events_tables_dict.values():
                     
         repair_df = event_df.loc[:, ["repairActionRequestDate [-]",
                                      "repairActionDate [-]",
@@ -284,7 +295,7 @@ def get_opex_per_year(start_date,
     eco_df = pd.DataFrame(eco_dict)
     eco_df = eco_df.set_index("Year")
             
-    for event_df in events_tables_dict.itervalues():
+    for event_df in events_tables_dict.values():
         
         if event_df.isnull().values.all(): continue
     
@@ -322,7 +333,7 @@ def get_opex_per_year(start_date,
 
             year_cost = 0.  
         
-            for name, comp_df in group_dict.iteritems():
+            for name, comp_df in group_dict.items():
                 
                 if year not in comp_df.index: continue
                     
@@ -386,6 +397,179 @@ def get_number_of_journeys(events_tables_dict):
     return total_ops
 
 
+def _poisson_trials_numpy(loopNumber, simulationTime, failureRate):
+
+    '''_poisson_trials_numpy function: Vectorised poisson trials using NumPy
+
+    Args:
+        loopNumber (int)       : number of trials
+        simulationtime (float) : simulation time [day]
+        failureRate (float)    : failure rate [1/day]
+
+    Returns:
+        numbers (numpy.ndarray)   : number of events in each trial
+        timeSteps (numpy.ndarray) : time steps of all trials, concatenated
+        offsets (numpy.ndarray)   : start index of each trial in timeSteps
+
+    '''
+
+    # The number of steps drawn per trial is set well above the expected
+    # number of events and topped up for any trial that has not yet reached
+    # the simulation time.
+    scale = 1.0 / failureRate
+    expectedNumber = simulationTime * failureRate
+    stepNumber = int(expectedNumber + 6 * math.sqrt(expectedNumber) + 20)
+
+    timeStepAll = np.random.exponential(scale,
+                                        size=(loopNumber,
+                                              stepNumber)).cumsum(axis=1)
+
+    while (timeStepAll[:, -1] < simulationTime).any():
+
+        extraSteps = np.random.exponential(scale,
+                                           size=(loopNumber, stepNumber))
+        timeStepAll = np.hstack((timeStepAll,
+                                 timeStepAll[:, -1:] +
+                                                 extraSteps.cumsum(axis=1)))
+
+    # keep the events before the simulation time in each trial
+    inTime = timeStepAll < simulationTime
+    numbers = inTime.sum(axis=1)
+    offsets = np.r_[0, numbers.cumsum()]
+
+    timeStepAll = timeStepAll[inTime]
+    timeSteps = np.diff(np.r_[0., timeStepAll])
+
+    starts = offsets[:-1][numbers > 0]
+    timeSteps[starts] = timeStepAll[starts]
+
+    return numbers, timeSteps, offsets
+
+
+def _poisson_draw_python(seeds,
+                         blockSize,
+                         loopNumber,
+                         simulationTime,
+                         failureRate,
+                         stepNumber):
+
+    '''_poisson_draw_python function: Poisson trials stored in a fixed number
+    of time steps per trial, for compilation with numba. Each block of
+    trials is seeded individually and blocks run in parallel when compiled.
+
+    Args:
+        seeds (numpy.ndarray)  : random seed of each block of trials
+        blockSize (int)        : number of trials per block
+        loopNumber (int)       : number of trials
+        simulationtime (float) : simulation time [day]
+        failureRate (float)    : failure rate [1/day]
+        stepNumber (int)       : number of time steps stored per trial
+
+    Returns:
+        numbers (numpy.ndarray)   : number of events in each trial
+        timeSteps (numpy.ndarray) : time steps of each trial, by row
+        overflow (numpy.ndarray)  : trials with more than stepNumber events
+
+    '''
+
+    scale = 1.0 / failureRate
+    numbers = np.zeros(loopNumber, dtype=np.int64)
+    timeSteps = np.empty((loopNumber, stepNumber))
+    overflow = np.zeros(loopNumber, dtype=np.bool_)
+
+    # block loop
+    for bCnt in prange(len(seeds)):
+
+        np.random.seed(seeds[bCnt])
+
+        # poisson trial loop
+        for lCnt in range(bCnt * blockSize,
+                          min((bCnt + 1) * blockSize, loopNumber)):
+
+            timeStepAll = 0.
+            number = 0
+
+            # time dt
+            dt = np.random.exponential(scale)
+
+            # calculation loop, stopping before the event that would reach
+            # the simulation time
+            while timeStepAll + dt < simulationTime and number < stepNumber:
+
+                timeSteps[lCnt, number] = dt
+                timeStepAll = timeStepAll + dt
+                number = number + 1
+                dt = np.random.exponential(scale)
+
+            numbers[lCnt] = number
+            overflow[lCnt] = timeStepAll + dt < simulationTime
+
+    return numbers, timeSteps, overflow
+
+
+if numba is not None:
+
+    _poisson_draw = numba.njit(cache=True,
+                               fastmath=True,
+                               nogil=True,
+                               parallel=True)(_poisson_draw_python)
+
+
+def _poisson_trials_numba(loopNumber, simulationTime, failureRate):
+
+    '''_poisson_trials_numba function: Parallel poisson trials using numba.
+    The time steps are stored with the same bound on the number of events
+    per trial as _poisson_trials_numpy, which is doubled and the trials
+    redrawn if any trial exceeds it. The seeds are drawn from the NumPy
+    random generator, so results follow numpy.random.seed.
+
+    Args:
+        loopNumber (int)       : number of trials
+        simulationtime (float) : simulation time [day]
+        failureRate (float)    : failure rate [1/day]
+
+    Returns:
+        numbers (numpy.ndarray)   : number of events in each trial
+        timeSteps (numpy.ndarray) : time steps of all trials, concatenated
+        offsets (numpy.ndarray)   : start index of each trial in timeSteps
+
+    '''
+
+    expectedNumber = simulationTime * failureRate
+    stepNumber = int(expectedNumber + 6 * math.sqrt(expectedNumber) + 20)
+
+    blockNumber = -(-loopNumber // _POISSON_BLOCK_SIZE)
+    seeds = np.random.randint(0, 2 ** 32, size=blockNumber, dtype=np.uint32)
+
+    while True:
+
+        (numbers,
+         timeSteps,
+         overflow) = _poisson_draw(seeds,
+                                   _POISSON_BLOCK_SIZE,
+                                   loopNumber,
+                                   simulationTime,
+                                   failureRate,
+                                   stepNumber)
+
+        if not overflow.any(): break
+
+        stepNumber *= 2
+
+    # keep the stored time steps of each trial
+    inTime = np.arange(stepNumber) < numbers[:, np.newaxis]
+    timeSteps = timeSteps[inTime]
+    offsets = np.r_[0, numbers.cumsum()]
+
+    return numbers, timeSteps, offsets
+
+
+if numba is None:
+    _poisson_trials = _poisson_trials_numpy
+else:
+    _poisson_trials = _poisson_trials_numba
+
+
 def poisson_process(startOperationDate, simulationTime, failureRate):
 
     '''poisson_process function: Estimation of random failure occurence of
@@ -401,91 +585,45 @@ def poisson_process(startOperationDate, simulationTime, failureRate):
 
     '''
 
-    # result of poisson process
-    randomList = []
-
-    # intermediate results
-    timeStep = []
-
-    # intermediate results
-    timeStepAll = 0
-    number      = 0
-
     # poison parameter
     loopNumber       = 2000
     lowerPercentile  = 40
     upperPercentile  = 70
-    timeStepLoop     = []
-    numberLoop       = []
-    numberLoopFilt   = []
-    timeStepLoopFilt = []
 
     dummyStartOperationDate = datetime.datetime(startOperationDate.year,
                                                 startOperationDate.month,
                                                 startOperationDate.day,
                                                 startOperationDate.hour)
 
-    endOperationDate = dummyStartOperationDate + \
-                                datetime.timedelta(days=simulationTime)
-
     # poisson trial loop
-    for lCnt in range(0, loopNumber):
+    (numberLoop,
+     timeStepLoop,
+     offsetLoop) = _poisson_trials(loopNumber, simulationTime, failureRate)
 
-        timeStepAll = 0
-        timeStep = []
-        number = 0
-        # calculation loop
-        while timeStepAll < simulationTime:
+    (lowerPercentileValue,
+     upperPercentileValue) = np.percentile(numberLoop, [lowerPercentile,
+                                                       upperPercentile])
 
-            # time dt
-            dt = -math.log(1.0 - random.random()) / failureRate
-            timeStepAll = timeStepAll + dt
-            number = number + 1
-            timeStep.append(dt)
+    loopIndexFilt = np.flatnonzero((numberLoop >= lowerPercentileValue) &
+                                   (numberLoop <= upperPercentileValue))
 
-        #delete last entries
-        number = number - 1
-        del timeStep[-1]
+    if len(loopIndexFilt) > 0:
 
-        #save loop results
-        numberLoop.append(number)
-        timeStepLoop.append(timeStep)
-
-    upperPercentileValue = np.percentile(numberLoop, upperPercentile)
-    lowerPercentileValue = np.percentile(numberLoop, lowerPercentile)
-
-    for lCnt in range(0, loopNumber):
-
-        if ((numberLoop[lCnt] >= lowerPercentileValue) &
-            (numberLoop[lCnt] <= upperPercentileValue)):
-
-            numberLoopFilt.append(numberLoop[lCnt])
-            timeStepLoopFilt.append(timeStepLoop[lCnt])
-
-    if len(numberLoopFilt) > 0:
-
-        loopIndex = random.randint(0, len(numberLoopFilt) - 1)
-        timeStep = timeStepLoopFilt[loopIndex]
-        number = numberLoopFilt[loopIndex]
+        loopIndex = np.random.choice(loopIndexFilt)
+        timeStep = timeStepLoop[offsetLoop[loopIndex]:
+                                                offsetLoop[loopIndex + 1]]
 
     else:
 
         timeStep = []
-        number = 0
-
-    TimeStamp = dummyStartOperationDate
-
-    for iCnt in range(0, len(timeStep)):
-
-        addTime = int(np.round(timeStep[iCnt]))
-        TimeStamp = TimeStamp + datetime.timedelta(days=addTime)
 
-        # take only the events less than endOperationDate
+    # event day offsets from the rounded, cumulative time steps, taking only
+    # the events up to the end of the simulation time
+    addTime = np.round(timeStep).astype('int64').cumsum()
+    addTime = addTime[addTime <= simulationTime]
 
-        #if TimeStamp <= endOperationDate and iCnt < maxNrOfEvents:
-        if TimeStamp <= endOperationDate:
-            randomList.append(TimeStamp)
-        else:
-            break
+    TimeStamp = np.datetime64(dummyStartOperationDate, 'h') + \
+                                            addTime.astype('timedelta64[D]')
+    randomList = TimeStamp.astype('O').tolist()
 
     return randomList
@@ -8,6 +8,8 @@
 .. moduleauthor:: Mathew Topper <mathew.topper@tecnalia.com>
 """
 
+from __future__ import print_function
+
 import os
 import sys
 
@@ -48,11 +50,11 @@ class CleanPyc(Command):
         pass
      
     def run(self):
-        print "start cleanup pyc files."
+        print("start cleanup pyc files.")
         for pyc_path in self.pickup_pyc():
-            print "remove pyc: {0}".format(pyc_path)
+            print("remove pyc: {0}".format(pyc_path))
             os.remove(pyc_path)
-        print "the end."
+        print("the end.")
      
     def is_exclude(self, path):
         for item in CleanPyc.exclude_list:
@@ -0,0 +1,566 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2017-2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pickle
+from collections import OrderedDict
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from dtocean_maintenance.logistics import (OMLog,
+                                           om_logistics_main,
+                                           om_logistics_batch,
+                                           _get_cache_key,
+                                           _check_deck_requirements)
+
+
+def test_OMLog_init():
+    
+    port = {'Selected base port for installation': None}
+    test = OMLog(port)
+    
+    assert test.port is port
+    assert test.findSolution == {}
+    assert set(test.keys()) == set(OMLog.__slots__)
+
+
+def test_OMLog_getitem():
+    
+    test = OMLog({})
+    test.findSolution = 'SolutionFound'
+    
+    assert test['findSolution'] == 'SolutionFound'
+
+
+def test_OMLog_setitem():
+    
+    test = OMLog({})
+    test['optimal'] = {'total cost': 1.}
+    
+    assert test.optimal == {'total cost': 1.}
+
+
+@pytest.mark.parametrize("key", ["keys", "mock"])
+def test_OMLog_getitem_missing(key):
+    
+    test = OMLog({})
+    
+    with pytest.raises(KeyError):
+        test[key]
+
+
+def test_OMLog_contains():
+    
+    test = OMLog({})
+    
+    assert 'cost' in test
+    assert 'mock' not in test
+
+
+def test_OMLog_to_dict():
+    
+    test = OMLog({})
+    result = test.to_dict()
+    
+    assert set(result.keys()) == set(OMLog.__slots__)
+    assert result['port'] == {}
+
+
+@pytest.mark.parametrize("protocol", [0, pickle.HIGHEST_PROTOCOL])
+def test_OMLog_pickle(protocol):
+    
+    test = OMLog({'Selected base port for installation': 1})
+    test.findSolution = 'SolutionFound'
+    
+    result = pickle.loads(pickle.dumps(test, protocol))
+    
+    assert result.to_dict() == test.to_dict()
+
+
+@pytest.fixture
+def vessels():
+    
+    vessels = pd.DataFrame({'Deck space [m^2]': [100., 500.],
+                            'Deck loading [t/m^2]': [5., 10.],
+                            'Max. cargo [t]': [50., 1000.]})
+    
+    return vessels
+
+
+@pytest.mark.parametrize("area, loading, cargo, expected", [
+                            (200., 6., 100., True),
+                            (600., 6., 100., False),
+                            (200., 6., np.nan, True),
+                            (100., 6., 100., True)])
+def test_check_deck_requirements(vessels, area, loading, cargo, expected):
+    
+    deck_requirements = {'deck area': area,
+                         'deck loading': loading,
+                         'deck cargo': cargo}
+    
+    assert _check_deck_requirements(vessels, deck_requirements) == expected
+
+
+@pytest.mark.parametrize("area, loading, cargo, expected", [
+                            (100., 5., 2000., True),
+                            (600., 6., 100., False),
+                            (200., 20., 100., False)])
+def test_check_deck_requirements_nan(vessels, area, loading, cargo, expected):
+    
+    vessels.loc[0, 'Max. cargo [t]'] = np.nan
+    deck_requirements = {'deck area': area,
+                         'deck loading': loading,
+                         'deck cargo': cargo}
+    
+    assert _check_deck_requirements(vessels, deck_requirements) == expected
+
+
+def get_om(port_index=0, t_start='01/01/2020 00:00:00', d_om=10.):
+    
+    om = pd.DataFrame({'ID [-]': ['MoS1'],
+                       'Port_Index [-]': [port_index],
+                       't_start [-]': [t_start],
+                       'd_om [hour]': [d_om]},
+                      columns=['ID [-]',
+                               'Port_Index [-]',
+                               't_start [-]',
+                               'd_om [hour]'])
+    
+    return om
+
+
+def run_om_logistics_main(om, solutions_cache=None, prescaled=True):
+    
+    ports = pd.DataFrame({'Name [-]': ['Port A', 'Port B']})
+    entry_point = {'x coord [m]': 0.}
+    
+    args = [None] * 18 + [om, False]
+    args[2] = ports
+    args[12] = entry_point
+    
+    return om_logistics_main(*args,
+                             solutions_cache=solutions_cache,
+                             prescaled=prescaled)
+
+
+@pytest.fixture
+def mock_find(mocker):
+    
+    def find_solutions(om_log, *args):
+        
+        om = args[-1]
+        
+        om_log.requirement = {'d_om': om['d_om [hour]'].iloc[0]}
+        om_log.eq_select = {}
+        om_log.ve_select = {}
+        om_log.combi_select = {}
+        
+        return {'phase': 'LpM1'}, 'Match'
+    
+    mocker.patch('dtocean_maintenance.logistics.logPhase_select',
+                 return_value='LpM1')
+    mocker.patch('dtocean_maintenance.logistics.sched_om',
+                 side_effect=lambda log_phase, *args: (log_phase, 'Found'))
+    mocker.patch('dtocean_maintenance.logistics.cost',
+                 side_effect=lambda om_log, log_phase, *args: ({},
+                                                               log_phase))
+    mocker.patch('dtocean_maintenance.logistics.opt_sol',
+                 return_value={})
+    
+    mock_find = mocker.patch('dtocean_maintenance.logistics._find_solutions',
+                             side_effect=find_solutions)
+    
+    return mock_find
+
+
+def test_om_logistics_main_cache_hit(mock_find):
+    
+    solutions_cache = OrderedDict()
+    
+    first = run_om_logistics_main(get_om(), solutions_cache)
+    second = run_om_logistics_main(get_om(t_start='01/06/2020 00:00:00'),
+                                   solutions_cache)
+    
+    assert mock_find.call_count == 1
+    assert len(solutions_cache) == 1
+    assert second.findSolution == 'SolutionFound'
+    assert second.requirement == first.requirement
+
+
+def test_om_logistics_main_cache_miss(mock_find):
+    
+    solutions_cache = OrderedDict()
+    
+    run_om_logistics_main(get_om(), solutions_cache)
+    second = run_om_logistics_main(get_om(port_index=1), solutions_cache)
+    third = run_om_logistics_main(get_om(d_om=20.), solutions_cache)
+    
+    assert mock_find.call_count == 3
+    assert len(solutions_cache) == 3
+    assert second.port['Selected base port for installation'][
+                                                    'Name [-]'] == 'Port B'
+    assert third.requirement == {'d_om': 20.}
+
+
+def test_om_logistics_main_cache_copies(mock_find):
+    
+    solutions_cache = OrderedDict()
+    
+    first = run_om_logistics_main(get_om(), solutions_cache)
+    first.requirement['d_om'] = -1.
+    
+    second = run_om_logistics_main(get_om(), solutions_cache)
+    second.requirement['d_om'] = -2.
+    
+    third = run_om_logistics_main(get_om(), solutions_cache)
+    
+    assert mock_find.call_count == 1
+    assert third.requirement == {'d_om': 10.}
+
+
+def test_om_logistics_main_cache_rows(mock_find):
+    
+    solutions_cache = OrderedDict()
+    
+    first = pd.concat([get_om(), get_om(d_om=20.)], ignore_index=True)
+    second = pd.concat([get_om(), get_om(d_om=30.)], ignore_index=True)
+    
+    run_om_logistics_main(first, solutions_cache)
+    run_om_logistics_main(second, solutions_cache)
+    run_om_logistics_main(get_om(), solutions_cache)
+    
+    assert mock_find.call_count == 3
+    assert len(solutions_cache) == 3
+    
+    run_om_logistics_main(second, solutions_cache)
+    
+    assert mock_find.call_count == 3
+
+
+def test_om_logistics_main_cache_nan(mock_find):
+    
+    solutions_cache = OrderedDict()
+    
+    run_om_logistics_main(get_om(d_om=np.nan), solutions_cache)
+    run_om_logistics_main(get_om(d_om=np.nan), solutions_cache)
+    
+    assert mock_find.call_count == 2
+    assert not solutions_cache
+
+
+def test_om_logistics_main_cache_none(mock_find):
+    
+    run_om_logistics_main(get_om())
+    run_om_logistics_main(get_om())
+    
+    assert mock_find.call_count == 2
+
+
+def test_om_logistics_main_cache_size(mocker, mock_find):
+    
+    mocker.patch('dtocean_maintenance.logistics._SOLUTIONS_CACHE_SIZE', 2)
+    
+    solutions_cache = OrderedDict()
+    
+    run_om_logistics_main(get_om(d_om=1.), solutions_cache)
+    run_om_logistics_main(get_om(d_om=2.), solutions_cache)
+    run_om_logistics_main(get_om(d_om=1.), solutions_cache)
+    run_om_logistics_main(get_om(d_om=3.), solutions_cache)
+    
+    assert mock_find.call_count == 3
+    assert len(solutions_cache) == 2
+    
+    d_oms = [key[2][0][-1] for key in solutions_cache]
+    
+    assert d_oms == [1., 3.]
+
+
+def test_om_logistics_main_numeric_om(mock_find):
+    
+    om = pd.DataFrame({'Port_Index [-]': [1],
+                       'd_om [hour]': [10.]})
+    
+    result = run_om_logistics_main(om, OrderedDict())
+    port = result.port['Selected base port for installation']
+    
+    assert port['Name [-]'] == 'Port B'
+    assert result.findSolution == 'SolutionFound'
+
+
+@pytest.mark.parametrize("prescaled", [True, False])
+def test_om_logistics_main_prescaled(mocker, mock_find, prescaled):
+    
+    ports = pd.DataFrame({'Name [-]': ['Port A']})
+    ports_safe = pd.DataFrame({'Name [-]': ['Port A safe']})
+    vessels = pd.DataFrame({'Name [-]': ['Vessel']})
+    vessels_safe = pd.DataFrame({'Name [-]': ['Vessel safe']})
+    equipments = {'rov': None}
+    equipments_safe = {'rov safe': None}
+    
+    mock_sf = mocker.patch('dtocean_maintenance.logistics.safety_factors',
+                           return_value=(ports_safe,
+                                         vessels_safe,
+                                         equipments_safe))
+    
+    args = [None] * 18 + [get_om(), False]
+    args[0] = vessels
+    args[1] = equipments
+    args[2] = ports
+    args[5] = 'port_sf'
+    args[6] = 'vessel_sf'
+    args[7] = 'eq_sf'
+    args[12] = {'x coord [m]': 0.}
+    
+    result = om_logistics_main(*args, prescaled=prescaled)
+    
+    find_args = mock_find.call_args[0]
+    port = result.port['Selected base port for installation']
+    
+    if prescaled:
+        
+        assert not mock_sf.called
+        assert find_args[3] is vessels
+        assert find_args[4] is equipments
+        assert port['Name [-]'] == 'Port A'
+    
+    else:
+        
+        mock_sf.assert_called_once_with(ports,
+                                        vessels,
+                                        equipments,
+                                        'port_sf',
+                                        'vessel_sf',
+                                        'eq_sf')
+        assert find_args[3] is vessels_safe
+        assert find_args[4] is equipments_safe
+        assert port['Name [-]'] == 'Port A safe'
+
+
+@pytest.fixture
+def mock_matching(mocker, vessels):
+    
+    """Mock the logistics functions, with a vessel selection that keeps the
+    vessels meeting all of the deck requirements and a matching that fails
+    if no vessels are selected
+    """
+    
+    def feas_om(log_phase, log_phase_id, om, *args):
+        
+        deck_requirements = {'deck area': om['deck area'].iloc[0],
+                             'deck loading': om['deck loading'].iloc[0],
+                             'deck cargo': om['deck cargo'].iloc[0]}
+        
+        return (None,) * 5 + (deck_requirements,)
+    
+    def select_v(om_log, log_phase):
+        
+        deck_requirements = om_log.requirement[5]
+        selected = pd.Series(True, index=vessels.index)
+        
+        for column, key in [('Deck space [m^2]', 'deck area'),
+                            ('Deck loading [t/m^2]', 'deck loading'),
+                            ('Max. cargo [t]', 'deck cargo')]:
+            
+            requirement = deck_requirements[key]
+            if pd.isnull(requirement): continue
+            
+            selected &= vessels[column] >= requirement
+        
+        return vessels[selected], log_phase
+    
+    def compatibility_ve(om_log, log_phase, port):
+        
+        if om_log.ve_select.empty:
+            return {}, log_phase, 'NoSolutions'
+        
+        return {}, log_phase, 'Match'
+    
+    mocker.patch('dtocean_maintenance.logistics.logOp_init')
+    mocker.patch('dtocean_maintenance.logistics.logPhase_om_init',
+                 return_value={'LpM1': mocker.MagicMock()})
+    mocker.patch('dtocean_maintenance.logistics.logPhase_select',
+                 return_value='LpM1')
+    mocker.patch('dtocean_maintenance.logistics.feas_om',
+                 side_effect=feas_om)
+    mocker.patch('dtocean_maintenance.logistics.select_e',
+                 side_effect=lambda om_log, log_phase: ({}, log_phase))
+    mocker.patch('dtocean_maintenance.logistics.select_v',
+                 side_effect=select_v)
+    mocker.patch('dtocean_maintenance.logistics.sched_om',
+                 side_effect=lambda log_phase, *args: (log_phase, 'Found'))
+    mocker.patch('dtocean_maintenance.logistics.cost',
+                 side_effect=lambda om_log, log_phase, *args: ({},
+                                                               log_phase))
+    mocker.patch('dtocean_maintenance.logistics.opt_sol',
+                 return_value={})
+    
+    mock_match = mocker.patch('dtocean_maintenance.logistics.'
+                              'compatibility_ve',
+                              side_effect=compatibility_ve)
+    
+    return mock_match
+
+
+@pytest.mark.parametrize("area, loading, cargo", [
+                            (200., 6., 100.),
+                            (600., 6., 100.),
+                            (200., 6., np.nan),
+                            (200., 6., 2000.),
+                            (100., 5., 2000.),
+                            (100., 20., 100.)])
+def test_om_logistics_main_deck_check(mocker,
+                                      mock_matching,
+                                      vessels,
+                                      area,
+                                      loading,
+                                      cargo):
+    
+    vessels.loc[0, 'Max. cargo [t]'] = np.nan
+    
+    om = get_om()
+    om['deck area'] = area
+    om['deck loading'] = loading
+    om['deck cargo'] = cargo
+    
+    def run(check):
+        
+        mocker.patch('dtocean_maintenance.logistics.'
+                     '_check_deck_requirements',
+                     side_effect=check)
+        
+        args = [None] * 18 + [om, False]
+        args[0] = vessels
+        args[2] = pd.DataFrame({'Name [-]': ['Port A']})
+        args[12] = {'x coord [m]': 0.}
+        
+        return om_logistics_main(*args, prescaled=True).findSolution
+    
+    checked = run(_check_deck_requirements)
+    matched = mock_matching.called
+    
+    mock_matching.reset_mock()
+    full = run(lambda *args: True)
+    
+    deck_requirements = {'deck area': area,
+                         'deck loading': loading,
+                         'deck cargo': cargo}
+    
+    assert checked == full
+    assert matched == _check_deck_requirements(vessels, deck_requirements)
+
+
+def test_get_cache_key():
+    
+    om = get_om()
+    
+    first = _get_cache_key('LpM1', om)
+    
+    om['t_start [-]'] = '01/06/2020 00:00:00'
+    second = _get_cache_key('LpM1', om)
+    
+    assert first == second
+    assert first[0] == 'LpM1'
+    assert first[1] == 1
+    assert '01/01/2020 00:00:00' not in first[2][0]
+
+
+def test_get_cache_key_unhashable():
+    
+    om = get_om()
+    om['ID [-]'] = [['MoS1']]
+    
+    assert _get_cache_key('LpM1', om) is None
+
+
+def test_om_logistics_batch(mocker):
+    
+    mock_main = mocker.patch('dtocean_maintenance.logistics.'
+                             'om_logistics_main',
+                             side_effect=lambda *args, **kwargs: args[18])
+    mock_sf = mocker.patch('dtocean_maintenance.logistics.safety_factors',
+                           return_value=(None, None, None))
+    
+    oms = pd.DataFrame({'Port_Index [-]': [0, 1, 0]},
+                       index=[3, 4, 5])
+    args = [None] * 18 + [oms, False]
+    
+    result = om_logistics_batch(*args)
+    
+    assert len(result) == 3
+    assert mock_sf.call_count == 1
+    assert mock_main.call_count == 3
+    
+    for i, om in enumerate(result):
+        assert list(om.index) == [0]
+        assert om['Port_Index [-]'].iloc[0] == oms['Port_Index [-]'].iloc[i]
+    
+    caches = [call[0][22] for call in mock_main.call_args_list]
+    
+    assert all(cache is caches[0] for cache in caches)
+    assert all(call[1]['prescaled'] for call in mock_main.call_args_list)
+
+
+class MockPool(object):
+    
+    """Runs the batch workers in a single process"""
+    
+    def __init__(self, processes, initializer, initargs):
+        
+        self.processes = processes
+        initializer(*initargs)
+        
+        return
+    
+    def map(self, func, iterable):
+        
+        return [func(x) for x in iterable]
+    
+    def terminate(self):
+        
+        return
+    
+    def join(self):
+        
+        return
+
+
+def test_om_logistics_batch_parallel(mocker):
+    
+    mock_main = mocker.patch('dtocean_maintenance.logistics.'
+                             'om_logistics_main',
+                             side_effect=lambda *args, **kwargs: args[18])
+    mocker.patch('dtocean_maintenance.logistics.safety_factors',
+                 return_value=(None, None, None))
+    mocker.patch('dtocean_maintenance.logistics.Pool',
+                 new=MockPool)
+    
+    oms = pd.DataFrame({'Port_Index [-]': [0, 1, 0]},
+                       index=[3, 4, 5])
+    args = [None] * 18 + [oms, False]
+    
+    result = om_logistics_batch(*args, parallel=True, processes=2)
+    
+    assert len(result) == 3
+    assert mock_main.call_count == 3
+    
+    for i, om in enumerate(result):
+        assert list(om.index) == [0]
+        assert om['Port_Index [-]'].iloc[0] == oms['Port_Index [-]'].iloc[i]
+    
+    assert all(call[1]['prescaled'] for call in mock_main.call_args_list)
@@ -28,7 +28,12 @@ from dtocean_maintenance.static import (Availability,
                                         get_device_energy_df,
                                         get_opex_per_year,
                                         get_opex_lcoe,
-                                        get_number_of_journeys)
+                                        get_number_of_journeys,
+                                        poisson_process,
+                                        _poisson_trials,
+                                        _poisson_trials_numpy,
+                                        _poisson_trials_numba,
+                                        _poisson_draw_python)
 
 
 @pytest.fixture(scope="module")
@@ -905,6 +910,145 @@ def test_get_number_of_journeys_all(events_tables_dict):
     assert total_ops == 102
     
     
+@pytest.mark.parametrize("poisson_trials", [_poisson_trials,
+                                            _poisson_trials_numpy])
+def test_poisson_trials(poisson_trials):
+    
+    loop_number = 100
+    simulation_time = 365.
+    
+    numbers, time_steps, offsets = poisson_trials(loop_number,
+                                                  simulation_time,
+                                                  2. / 365)
+    
+    assert len(numbers) == loop_number
+    assert len(offsets) == loop_number + 1
+    assert offsets[-1] == len(time_steps)
+    assert (np.diff(offsets) == numbers).all()
+    assert (time_steps > 0).all()
+    
+    for i in range(loop_number):
+        assert time_steps[offsets[i]:offsets[i + 1]].sum() < simulation_time
+
+
+def test_poisson_draw_python():
+    
+    simulation_time = 365.
+    failure_rate = 2. / 365
+    seeds = np.arange(3, dtype=np.uint32)
+    
+    numbers, time_steps, overflow = _poisson_draw_python(seeds,
+                                                         4,
+                                                         10,
+                                                         simulation_time,
+                                                         failure_rate,
+                                                         100)
+    
+    assert len(numbers) == 10
+    assert time_steps.shape == (10, 100)
+    assert not overflow.any()
+    
+    for i in range(10):
+        assert (time_steps[i, :numbers[i]] > 0).all()
+        assert time_steps[i, :numbers[i]].sum() < simulation_time
+    
+    repeat, _, _ = _poisson_draw_python(seeds,
+                                        4,
+                                        10,
+                                        simulation_time,
+                                        failure_rate,
+                                        100)
+    
+    assert (repeat == numbers).all()
+
+
+def test_poisson_draw_python_overflow():
+    
+    seeds = np.arange(2, dtype=np.uint32)
+    
+    numbers, _, overflow = _poisson_draw_python(seeds, 5, 10, 365., 0.5, 1)
+    
+    assert (numbers == 1).all()
+    assert overflow.all()
+
+
+def test_poisson_trials_numba_overflow(mocker):
+    
+    step_numbers = []
+    
+    def draw(seeds,
+             block_size,
+             loop_number,
+             simulation_time,
+             failure_rate,
+             step_number):
+        
+        step_numbers.append(step_number)
+        
+        # Force an overflow on the first draw
+        if len(step_numbers) == 1: step_number = 1
+        
+        return _poisson_draw_python(seeds,
+                                    block_size,
+                                    loop_number,
+                                    simulation_time,
+                                    failure_rate,
+                                    step_number)
+    
+    mocker.patch('dtocean_maintenance.static._poisson_draw',
+                 side_effect=_poisson_draw_python,
+                 create=True)
+    
+    np.random.seed(1)
+    expected = _poisson_trials_numba(120, 365., 0.05)
+    
+    mocker.patch('dtocean_maintenance.static._poisson_draw',
+                 side_effect=draw,
+                 create=True)
+    
+    np.random.seed(1)
+    result = _poisson_trials_numba(120, 365., 0.05)
+    
+    assert len(step_numbers) == 2
+    assert step_numbers[1] == 2 * step_numbers[0]
+    
+    for test, control in zip(result, expected):
+        assert (test == control).all()
+
+
+def test_poisson_process():
+    
+    start_date = dt.datetime(2016, 1, 1)
+    simulation_time = 365
+    
+    events = poisson_process(start_date, simulation_time, 2. / 365)
+    
+    assert events
+    assert all(isinstance(x, dt.datetime) for x in events)
+    assert events == sorted(events)
+    assert min(events) >= start_date
+    assert max(events) <= start_date + dt.timedelta(days=simulation_time)
+
+
+def test_poisson_process_dates(mocker):
+    
+    numbers = np.array([4, 4])
+    time_steps = np.array([1.4, 2.6, 6., 0.6] * 2)
+    offsets = np.array([0, 4, 8])
+    
+    mocker.patch('dtocean_maintenance.static._poisson_trials',
+                 return_value=(numbers, time_steps, offsets))
+    
+    start_date = dt.datetime(2016, 1, 1, 6, 30)
+    
+    events = poisson_process(start_date, 10, 0.4)
+    expected = [dt.datetime(2016, 1, 2, 6),
+                dt.datetime(2016, 1, 5, 6),
+                dt.datetime(2016, 1, 11, 6)]
+    
+    assert events == expected
+
+
 def test_Availability_init(availability):
     
     assert availability._max_uptime